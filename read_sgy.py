@@ -1,9 +1,166 @@
 import numpy as np
 import struct
-import matplotlib.pyplot as plt
 import os
 import argparse
+import collections
+import time
+import glob
+import zlib
+import tempfile
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from txt2sgy import EBCDIC_TO_ASCII
+
+# Number of bytes of fixed-length traces read and decoded per call
+TRACE_BLOCK_BYTES = 64 * 1024 * 1024
+
+# Number of bytes each reader thread fetches per positional read
+THREAD_BLOCK_BYTES = 8 * 1024 * 1024
+
+# Largest number of traces drawn as wiggles rather than as an image
+WIGGLE_MAX_TRACES = 400
+
+# Figure size in inches of batch thumbnails (100 dpi, so 400x300 pixels)
+THUMBNAIL_FIGSIZE = (4, 3)
+
+# Approximate number of bytes held in memory per block of a streaming CSV export
+CSV_BLOCK_BYTES = 32 * 1024 * 1024
+
+# Data sample format codes: (description, bytes per sample, big-endian dtype);
+# 3-byte integers have no NumPy dtype and are assembled from their bytes
+SAMPLE_FORMATS = {
+    1: ("4-byte IBM floating-point", 4, '>u4'),
+    2: ("4-byte two's complement integer", 4, '>i4'),
+    3: ("2-byte two's complement integer", 2, '>i2'),
+    5: ("4-byte IEEE floating-point", 4, '>f4'),
+    6: ("8-byte IEEE floating-point", 8, '>f8'),
+    7: ("3-byte two's complement integer", 3, None),
+    8: ("1-byte two's complement integer", 1, 'i1'),
+    9: ("8-byte two's complement integer", 8, '>i8'),
+    10: ("4-byte unsigned integer", 4, '>u4'),
+    11: ("2-byte unsigned integer", 2, '>u2'),
+    12: ("8-byte unsigned integer", 8, '>u8'),
+    15: ("3-byte unsigned integer", 3, None),
+    16: ("1-byte unsigned integer", 1, 'u1'),
+}
+
+# Data formats whose samples are all exact in float32, so that 9 significant
+# digits write them to text without loss; the others need 17 (IBM floats
+# have float32 precision but exponents up to 16**63)
+FLOAT32_EXACT_FORMATS = (3, 5, 7, 8, 11, 15, 16)
+
+# Standard SEG-Y rev1/rev2 trace header fields: (name, first byte, dtype);
+# bytes 233-240 are unassigned
+TRACE_HEADER_FIELDS = [
+    ('trace_sequence_line', 1, 'i4'),
+    ('trace_sequence_file', 5, 'i4'),
+    ('field_record', 9, 'i4'),
+    ('trace_number', 13, 'i4'),
+    ('energy_source_point', 17, 'i4'),
+    ('cdp', 21, 'i4'),
+    ('cdp_trace', 25, 'i4'),
+    ('trace_id_code', 29, 'i2'),
+    ('vertically_summed_traces', 31, 'i2'),
+    ('horizontally_stacked_traces', 33, 'i2'),
+    ('data_use', 35, 'i2'),
+    ('offset', 37, 'i4'),
+    ('receiver_elevation', 41, 'i4'),
+    ('source_surface_elevation', 45, 'i4'),
+    ('source_depth', 49, 'i4'),
+    ('receiver_datum_elevation', 53, 'i4'),
+    ('source_datum_elevation', 57, 'i4'),
+    ('source_water_depth', 61, 'i4'),
+    ('receiver_water_depth', 65, 'i4'),
+    ('elevation_scalar', 69, 'i2'),
+    ('coordinate_scalar', 71, 'i2'),
+    ('source_x', 73, 'i4'),
+    ('source_y', 77, 'i4'),
+    ('group_x', 81, 'i4'),
+    ('group_y', 85, 'i4'),
+    ('coordinate_units', 89, 'i2'),
+    ('weathering_velocity', 91, 'i2'),
+    ('subweathering_velocity', 93, 'i2'),
+    ('source_uphole_time', 95, 'i2'),
+    ('group_uphole_time', 97, 'i2'),
+    ('source_static_correction', 99, 'i2'),
+    ('group_static_correction', 101, 'i2'),
+    ('total_static', 103, 'i2'),
+    ('lag_time_a', 105, 'i2'),
+    ('lag_time_b', 107, 'i2'),
+    ('delay_recording_time', 109, 'i2'),
+    ('mute_time_start', 111, 'i2'),
+    ('mute_time_end', 113, 'i2'),
+    ('num_samples', 115, 'u2'),
+    ('sample_interval', 117, 'u2'),
+    ('gain_type', 119, 'i2'),
+    ('instrument_gain_constant', 121, 'i2'),
+    ('instrument_initial_gain', 123, 'i2'),
+    ('correlated', 125, 'i2'),
+    ('sweep_frequency_start', 127, 'i2'),
+    ('sweep_frequency_end', 129, 'i2'),
+    ('sweep_length', 131, 'i2'),
+    ('sweep_type', 133, 'i2'),
+    ('sweep_taper_length_start', 135, 'i2'),
+    ('sweep_taper_length_end', 137, 'i2'),
+    ('taper_type', 139, 'i2'),
+    ('alias_filter_frequency', 141, 'i2'),
+    ('alias_filter_slope', 143, 'i2'),
+    ('notch_filter_frequency', 145, 'i2'),
+    ('notch_filter_slope', 147, 'i2'),
+    ('low_cut_frequency', 149, 'i2'),
+    ('high_cut_frequency', 151, 'i2'),
+    ('low_cut_slope', 153, 'i2'),
+    ('high_cut_slope', 155, 'i2'),
+    ('year', 157, 'i2'),
+    ('day_of_year', 159, 'i2'),
+    ('hour', 161, 'i2'),
+    ('minute', 163, 'i2'),
+    ('second', 165, 'i2'),
+    ('time_basis_code', 167, 'i2'),
+    ('trace_weighting_factor', 169, 'i2'),
+    ('geophone_group_roll_switch', 171, 'i2'),
+    ('geophone_group_first_trace', 173, 'i2'),
+    ('geophone_group_last_trace', 175, 'i2'),
+    ('gap_size', 177, 'i2'),
+    ('over_travel', 179, 'i2'),
+    ('cdp_x', 181, 'i4'),
+    ('cdp_y', 185, 'i4'),
+    ('inline', 189, 'i4'),
+    ('crossline', 193, 'i4'),
+    ('shotpoint', 197, 'i4'),
+    ('shotpoint_scalar', 201, 'i2'),
+    ('trace_value_unit', 203, 'i2'),
+    ('transduction_constant_mantissa', 205, 'i4'),
+    ('transduction_constant_exponent', 209, 'i2'),
+    ('transduction_units', 211, 'i2'),
+    ('device_id', 213, 'i2'),
+    ('time_scalar', 215, 'i2'),
+    ('source_type', 217, 'i2'),
+    ('source_energy_direction_vertical', 219, 'i2'),
+    ('source_energy_direction_crossline', 221, 'i2'),
+    ('source_energy_direction_inline', 223, 'i2'),
+    ('source_measurement_mantissa', 225, 'i4'),
+    ('source_measurement_exponent', 229, 'i2'),
+    ('source_measurement_unit', 231, 'i2'),
+]
+
+# Big-endian view of one 240-byte trace header
+TRACE_HEADER_DTYPE = np.dtype({
+    'names': [name for name, _, _ in TRACE_HEADER_FIELDS],
+    'formats': ['>' + code for _, _, code in TRACE_HEADER_FIELDS],
+    'offsets': [byte - 1 for _, byte, _ in TRACE_HEADER_FIELDS],
+    'itemsize': 240,
+})
+
+# Packed native-endian table the decoded headers are returned in
+TRACE_HEADER_TABLE_DTYPE = np.dtype([(name, code) for name, _, code in TRACE_HEADER_FIELDS])
+
+# Trace header columns kept in the sidecar index (and shown by --scan)
+INDEX_COLUMNS = ('num_samples', 'sample_interval', 'field_record', 'cdp', 'offset', 'inline', 'crossline')
+
+# IBM float scale factor for each sign/exponent byte: +-16**(exponent - 64) / 2**24
+IBM_SCALE = np.ldexp(np.where(np.arange(256) >= 128, -1.0, 1.0),
+                     4 * ((np.arange(256) & 0x7f) - 64) - 24)
 
 def read_segy_file(file_path, verbose=False):
     """
@@ -32,9 +189,7 @@ def read_segy_file(file_path, verbose=False):
         binary_header = f.read(400)
         
         # Extract key information from binary header
-        sample_interval = struct.unpack('>H', binary_header[16:18])[0]
-        num_samples = struct.unpack('>H', binary_header[20:22])[0]
-        format_code = struct.unpack('>H', binary_header[24:26])[0]
+        sample_interval, num_samples, format_code = binary_header_info(binary_header)
         
         if verbose:
             print("\nBinary Header Info:")
@@ -43,19 +198,42 @@ def read_segy_file(file_path, verbose=False):
             print(f"Data format code: {format_code}")
             
             # Determine data format
-            format_desc = {
-                1: "4-byte IBM floating-point",
-                2: "4-byte two's complement integer",
-                3: "2-byte two's complement integer",
-                4: "4-byte fixed-point with gain",
-                5: "4-byte IEEE floating-point",
-                8: "1-byte two's complement integer"
-            }
-            print(f"Data format: {format_desc.get(format_code, 'Unknown')}")
+            print(f"Data format: {SAMPLE_FORMATS.get(format_code, ('Unknown',))[0]}")
+            if format_code not in SAMPLE_FORMATS:
+                print(f"Warning: Unsupported data format {format_code}, reading as zeros")
+        
+        # Skip any extended textual headers
+        f.seek(data_start_offset(f, binary_header))
         
         # Read trace data
         traces = []
         trace_count = 0
+        first_trace = None
+        fixed_length = struct.unpack('>H', binary_header[302:304])[0] == 1
+        sample_bytes = sample_size(format_code)
+        
+        # Fixed-length traces are read and decoded a block at a time
+        if fixed_length and num_samples:
+            dtype = trace_record_dtype(num_samples, format_code)
+            traces_per_block = max(1, TRACE_BLOCK_BYTES // dtype.itemsize)
+            while True:
+                buffer = f.read(traces_per_block * dtype.itemsize)
+                records = np.frombuffer(buffer, dtype=dtype, count=len(buffer) // dtype.itemsize)
+                
+                # Leave partial or disagreeing traces to the per-trace loop
+                if not len(records) or np.any((records['num_samples'] != 0) &
+                                              (records['num_samples'] != num_samples)):
+                    f.seek(-len(buffer), os.SEEK_CUR)
+                    break
+                
+                if first_trace is None:
+                    first_trace = (num_samples, int(records['sample_interval'][0]) or sample_interval)
+                traces.extend(decode_samples(records['data'], format_code))
+                trace_count += len(records)
+                
+                if len(records) * dtype.itemsize < len(buffer):
+                    f.seek(len(records) * dtype.itemsize - len(buffer), os.SEEK_CUR)
+                    break
         
         # Continue reading until end of file
         while True:
@@ -69,180 +247,1110 @@ def read_segy_file(file_path, verbose=False):
             # Extract trace header info
             trace_samples = struct.unpack('>H', trace_header[114:116])[0] or num_samples
             trace_interval = struct.unpack('>H', trace_header[116:118])[0] or sample_interval
+            if first_trace is None:
+                first_trace = (trace_samples, trace_interval)
             
             # Read trace data
-            if format_code == 5:  # IEEE floating-point
-                trace_data = np.array([struct.unpack('>f', f.read(4))[0] for _ in range(trace_samples)])
-            elif format_code == 1:  # IBM floating-point
-                trace_data = np.array([ibm_to_float(f.read(4)) for _ in range(trace_samples)])
-            else:
-                # Skip unsupported formats for now
-                f.seek(4 * trace_samples, os.SEEK_CUR)
-                trace_data = np.zeros(trace_samples)
-                if verbose:
-                    print(f"Warning: Unsupported data format {format_code}")
+            trace_bytes = f.read(sample_bytes * trace_samples)
+            if len(trace_bytes) < sample_bytes * trace_samples:
+                raise ValueError(f"Trace {trace_count} is truncated")
+            trace_data = decode_samples(trace_bytes, format_code)
             
             traces.append(trace_data)
-            
-            if verbose and trace_count == 1:
-                print(f"\nFirst Trace Header Info:")
-                print(f"Number of samples: {trace_samples}")
-                print(f"Sample interval: {trace_interval} microseconds")
+        
+        if verbose and first_trace:
+            print(f"\nFirst Trace Header Info:")
+            print(f"Number of samples: {first_trace[0]}")
+            print(f"Sample interval: {first_trace[1]} microseconds")
         
         if verbose:
             print(f"\nTotal number of traces read: {trace_count}")
         
         return ebcdic_header, binary_header, traces
 
-def ebcdic_to_ascii(ebcdic_bytes):
+def decoded_dtype(format_code):
+    """
+    float32 for data formats whose samples it holds exactly, float64 otherwise
+    """
+    return np.dtype(np.float32 if format_code in FLOAT32_EXACT_FORMATS else np.float64)
+
+def sample_size(format_code):
+    """
+    Number of bytes per sample for a data format code (4 for unknown codes)
+    """
+    return SAMPLE_FORMATS.get(format_code, (None, 4, None))[1]
+
+def trace_record_dtype(num_samples, format_code):
+    """
+    Build the record dtype of one fixed-length trace for reading
+    
+    Parameters:
+    num_samples (int): Number of samples in each trace
+    format_code (int): Data sample format code from the binary header
+    
+    Returns:
+    numpy.dtype: Record with the header sample count and interval and the
+        raw sample bytes as a 'data' field of uint8
+    """
+    data_bytes = sample_size(format_code) * num_samples
+    return np.dtype({
+        # Bytes 115-116: Number of samples in this trace
+        # Bytes 117-118: Sample interval in microseconds
+        # Bytes 241-: Raw trace data samples
+        'names': ['num_samples', 'sample_interval', 'data'],
+        'formats': ['>u2', '>u2', ('u1', (data_bytes,))],
+        'offsets': [114, 116, 240],
+        'itemsize': 240 + data_bytes,
+    })
+
+def decode_samples(trace_bytes, format_code):
+    """
+    Decode the raw data block of one trace, or of many traces at once
+    
+    Parameters:
+    trace_bytes (bytes or numpy.ndarray): Sample bytes of one trace, or a
+        uint8 array whose last axis holds the sample bytes of each trace
+    format_code (int): Data sample format code from the binary header
+    
+    Returns:
+    numpy.ndarray: float64 array of samples (zeros for unsupported formats)
+    """
+    raw = trace_bytes
+    if not isinstance(raw, np.ndarray):
+        raw = np.frombuffer(raw, dtype=np.uint8)
+    _, size, dtype = SAMPLE_FORMATS.get(format_code, (None, 4, None))
+    
+    if format_code == 1:  # IBM floating-point
+        return ibm_to_float(raw.view('>u4'))
+    elif dtype:
+        return raw.view(dtype).astype(np.float64)
+    elif size == 3:
+        # Assemble big-endian 3-byte integers, sign-extending format 7
+        b = raw.reshape(raw.shape[:-1] + (-1, 3)).astype(np.int32)
+        values = (b[..., 0] << 16) | (b[..., 1] << 8) | b[..., 2]
+        if format_code == 7:
+            values = (values << 8) >> 8
+        return values.astype(np.float64)
+    else:
+        # Unsupported formats read as zeros
+        return np.zeros(raw.shape[:-1] + (raw.shape[-1] // size,))
+
+def decode_trace_headers(header_bytes):
     """
-    Simple EBCDIC to ASCII conversion for display purposes
-    """
-    # Very simplified EBCDIC to ASCII mapping for common characters
-    result = ""
-    for byte in ebcdic_bytes:
-        if byte == 64:  # EBCDIC space
-            result += " "
-        elif 192 <= byte <= 201:  # EBCDIC numbers
-            result += chr(byte - 192 + 48)
-        elif 193 <= byte <= 218:  # EBCDIC uppercase
-            result += chr(byte - 128)
-        elif 129 <= byte <= 154:  # EBCDIC lowercase
-            result += chr(byte - 32)
-        elif byte == 96:  # EBCDIC hyphen
-            result += "-"
-        elif byte == 122:  # EBCDIC colon
-            result += ":"
+    Decode trace headers into a table with one row per trace
+    
+    Parameters:
+    header_bytes (bytes or numpy.ndarray): Concatenated 240-byte trace
+        headers, or a uint8 array whose last axis holds one header per row
+    
+    Returns:
+    numpy.ndarray: Structured array of TRACE_HEADER_TABLE_DTYPE, e.g.
+        headers[np.argsort(headers, order=('inline', 'crossline'))]
+    """
+    raw = header_bytes
+    if not isinstance(raw, np.ndarray):
+        raw = np.frombuffer(raw, dtype=np.uint8)
+    return raw.reshape(-1, 240).view(TRACE_HEADER_DTYPE)[:, 0].astype(TRACE_HEADER_TABLE_DTYPE)
+
+class SegyFile:
+    """
+    Random-access SEG-Y reader that decodes traces only when indexed
+    
+    Trace positions are held in an offset table, computed from the file size
+    for fixed-length files and from a scan of the trace headers otherwise.
+    
+    With index=True the offset table and the INDEX_COLUMNS trace header
+    columns are cached in a sidecar file (file_path + '.idx.npz') and reused
+    on later opens while the file size, modification time and a checksum of
+    the file headers still match.
+    
+    Example:
+        with SegyFile('survey.sgy') as segy:
+            traces = segy[10000:10011]
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    index (bool): Whether to use and maintain the sidecar index (default: False)
+    """
+    
+    def __init__(self, file_path, index=False):
+        self.file_path = file_path
+        self.file = open(file_path, 'rb')
+        try:
+            self.ebcdic_header = self.file.read(3200)
+            self.binary_header = self.file.read(400)
+            self.sample_interval, self.num_samples, self.format_code = binary_header_info(self.binary_header)
+            self.fixed_length = struct.unpack('>H', self.binary_header[302:304])[0] == 1
+            self.sample_bytes = sample_size(self.format_code)
+            self.data_start = data_start_offset(self.file, self.binary_header)
+            self.header_columns = {}
+            if not (index and self.load_index()):
+                self.offsets, self.trace_samples = self.scan_offsets()
+                if index:
+                    self.save_index()
+        except Exception:
+            self.file.close()
+            raise
+    
+    def scan_offsets(self):
+        """
+        Build the trace offset table
+        
+        Returns:
+        tuple: (byte offset of each trace header, number of samples in each trace)
+        """
+        file_size = os.fstat(self.file.fileno()).st_size
+        
+        # Fixed-length traces are laid out at a constant stride
+        if self.fixed_length and self.num_samples:
+            trace_size = 240 + self.sample_bytes * self.num_samples
+            num_traces = max((file_size - self.data_start) // trace_size, 0)
+            offsets = self.data_start + trace_size * np.arange(num_traces, dtype=np.int64)
+            return offsets, np.full(num_traces, self.num_samples, dtype=np.int64)
+        
+        # Otherwise hop from one trace header to the next, reading only the
+        # sample count of each
+        offsets = []
+        trace_samples = []
+        offset = self.data_start
+        while offset + 240 <= file_size:
+            samples = struct.unpack('>H', self.read_at(offset + 114, 2))[0] or self.num_samples
+            if offset + 240 + self.sample_bytes * samples > file_size:
+                break
+            offsets.append(offset)
+            trace_samples.append(samples)
+            offset += 240 + self.sample_bytes * samples
+        return np.array(offsets, dtype=np.int64), np.array(trace_samples, dtype=np.int64)
+    
+    def index_key(self):
+        """
+        Values that must match for a sidecar index to be reused
+        
+        Returns:
+        numpy.ndarray: (file size, modification time in ns, CRC-32 of the
+            textual and binary headers, offset of the first trace)
+        """
+        stat = os.fstat(self.file.fileno())
+        checksum = zlib.crc32(self.ebcdic_header + self.binary_header)
+        return np.array([stat.st_size, stat.st_mtime_ns, checksum, self.data_start], dtype=np.int64)
+    
+    def load_index(self):
+        """
+        Load the offset table and header columns from a valid sidecar index
+        
+        Returns:
+        bool: Whether a valid index was found and loaded
+        """
+        try:
+            with np.load(self.file_path + '.idx.npz') as saved:
+                if not np.array_equal(saved['key'], self.index_key()):
+                    return False
+                self.offsets = saved['offsets']
+                self.trace_samples = saved['trace_samples']
+                self.header_columns = {name[len('column_'):]: saved[name]
+                                       for name in saved.files if name.startswith('column_')}
+        except Exception:
+            # The index is only a cache; an unreadable one is rebuilt
+            return False
+        return True
+    
+    def save_index(self):
+        """
+        Write the offset table and header columns to the sidecar index
+        
+        Failures (e.g. a read-only archive directory) are ignored; the index
+        is only a cache.
+        """
+        headers = self.headers()
+        self.header_columns = {name: headers[name] for name in INDEX_COLUMNS}
+        index_path = self.file_path + '.idx.npz'
+        try:
+            with open(index_path + '.tmp', 'wb') as f:
+                np.savez(f, key=self.index_key(), offsets=self.offsets, trace_samples=self.trace_samples,
+                         **{'column_' + name: column for name, column in self.header_columns.items()})
+            os.replace(index_path + '.tmp', index_path)
+        except OSError:
+            pass
+    
+    def headers(self):
+        """
+        Decode the trace headers of every trace without reading sample data
+        
+        Fixed-length files are accessed through a strided memory map of the
+        240-byte headers, so data pages are never loaded when traces span
+        more than a page; other files are read header by header at the
+        offsets in the offset table.
+        
+        Returns:
+        numpy.ndarray: Structured array of TRACE_HEADER_TABLE_DTYPE
+        """
+        if not len(self):
+            return np.empty(0, dtype=TRACE_HEADER_TABLE_DTYPE)
+        
+        if self.fixed_length and self.num_samples:
+            dtype = np.dtype({
+                'names': ['header'],
+                'formats': [TRACE_HEADER_DTYPE],
+                'offsets': [0],
+                'itemsize': 240 + self.sample_bytes * self.num_samples,
+            })
+            records = np.memmap(self.file_path, dtype=dtype, mode='r',
+                                offset=int(self.offsets[0]), shape=(len(self),))
+            return records['header'].astype(TRACE_HEADER_TABLE_DTYPE)
+        
+        header_bytes = bytearray(240 * len(self))
+        for i, offset in enumerate(self.offsets):
+            header_bytes[240 * i:240 * (i + 1)] = self.read_at(int(offset), 240)
+        return decode_trace_headers(bytes(header_bytes))
+    
+    def check_complete(self):
+        """
+        Raise ValueError if the file ends inside a trace, as read_segy_file does
+        
+        Fewer than 240 trailing bytes are ignored like an incomplete trace header.
+        """
+        end = self.data_start
+        if len(self):
+            end = int(self.offsets[-1]) + 240 + self.sample_bytes * int(self.trace_samples[-1])
+        if os.fstat(self.file.fileno()).st_size - end >= 240:
+            raise ValueError(f"Trace {len(self) + 1} is truncated")
+    
+    def read_at(self, offset, size):
+        """
+        Read size bytes at an absolute offset with a single positional read
+        """
+        if hasattr(os, 'pread'):
+            return os.pread(self.file.fileno(), size, offset)
+        self.file.seek(offset)
+        return self.file.read(size)
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    def __getitem__(self, index):
+        """
+        Return one trace for an integer index or a list of traces for a slice
+        """
+        if isinstance(index, slice):
+            indices = range(len(self))[index]
+            
+            # A contiguous run of fixed-length traces is read in one call
+            if self.fixed_length and self.num_samples and indices.step == 1 and len(indices) > 1:
+                dtype = trace_record_dtype(self.num_samples, self.format_code)
+                self.file.seek(self.offsets[indices.start])
+                records = np.frombuffer(self.file.read(dtype.itemsize * len(indices)), dtype=dtype)
+                return list(decode_samples(records['data'], self.format_code))
+            
+            return [self[i] for i in indices]
+        
+        index = range(len(self))[index]
+        self.file.seek(self.offsets[index] + 240)
+        return decode_samples(self.file.read(self.sample_bytes * self.trace_samples[index]), self.format_code)
+    
+    def close(self):
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def print_segy_details(segy):
+    """
+    Print the textual header, binary header fields and first trace header
+    
+    Parameters:
+    segy (SegyFile): Open SEG-Y file
+    """
+    print("EBCDIC Header:")
+    print(ebcdic_to_ascii(segy.ebcdic_header))
+    
+    print("\nBinary Header Info:")
+    print(f"Sample interval: {segy.sample_interval} microseconds")
+    print(f"Number of samples per trace: {segy.num_samples}")
+    print(f"Data format code: {segy.format_code}")
+    print(f"Data format: {SAMPLE_FORMATS.get(segy.format_code, ('Unknown',))[0]}")
+    if segy.format_code not in SAMPLE_FORMATS:
+        print(f"Warning: Unsupported data format {segy.format_code}, reading as zeros")
+    
+    if len(segy):
+        # Bytes 117-118: Sample interval of the first trace
+        trace_interval = struct.unpack('>H', segy.read_at(int(segy.offsets[0]) + 116, 2))[0]
+        print(f"\nFirst Trace Header Info:")
+        print(f"Number of samples: {segy.trace_samples[0]}")
+        print(f"Sample interval: {trace_interval or segy.sample_interval} microseconds")
+    
+    print(f"\nTotal number of traces read: {len(segy)}")
+
+def read_trace_headers(file_path):
+    """
+    Decode the standard trace header fields of every trace in a SEG-Y file
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    
+    Returns:
+    numpy.ndarray: Structured array of TRACE_HEADER_TABLE_DTYPE
+    """
+    with SegyFile(file_path) as segy:
+        return segy.headers()
+
+def pread_into(fd, buffer, offset):
+    """
+    Fill a writable buffer from an absolute file offset with positional reads
+    
+    Parameters:
+    fd (int): Open file descriptor
+    buffer (numpy.ndarray): Contiguous uint8 array to fill
+    offset (int): Byte offset in the file
+    """
+    view = memoryview(buffer)
+    while len(view):
+        if hasattr(os, 'preadv'):
+            count = os.preadv(fd, [view], offset)
         else:
-            result += "."
+            data = os.pread(fd, len(view), offset)
+            count = len(data)
+            view[:count] = data
+        if not count:
+            raise ValueError(f"Unexpected end of file at byte {offset}")
+        view = view[count:]
+        offset += count
+
+def read_trace_range(file_path, start=0, stop=None, workers=None):
+    """
+    Read a range of fixed-length traces on a pool of threads
+    
+    The range is split into blocks; each thread reads its blocks with
+    positional reads (no shared file position) and converts them straight
+    into its rows of one preallocated output array. Both steps release the
+    GIL, so several reads are in flight at once.
+    
+    Parameters:
+    file_path (str): Path to a fixed-length SEG-Y file
+    start (int): Index of the first trace (default: 0)
+    stop (int): Index one past the last trace (default: end of file)
+    workers (int): Number of reader threads (default: one per CPU)
+    
+    Returns:
+    numpy.ndarray: Array of shape (traces, samples), float32 or float64 as
+        given by decoded_dtype (e.g. float64 for IBM and 4-byte integers)
+    """
+    with SegyFile(file_path) as segy:
+        if not segy.fixed_length:
+            raise ValueError(f"{file_path} does not have the fixed-length trace flag set")
+        if not segy.num_samples:
+            raise ValueError(f"{file_path} has no sample count in the binary header")
+        
+        first, last, _ = slice(start, stop).indices(len(segy))
+        dtype = trace_record_dtype(segy.num_samples, segy.format_code)
+        samples = np.empty((max(last - first, 0), segy.num_samples), dtype=decoded_dtype(segy.format_code))
+        fd = segy.file.fileno()
+        sample_dtype = SAMPLE_FORMATS.get(segy.format_code, (None, None, None))[2]
+        traces_per_block = max(1, THREAD_BLOCK_BYTES // dtype.itemsize)
+        
+        def read_block(block_start):
+            count = min(traces_per_block, last - block_start)
+            buffer = np.empty(count * dtype.itemsize, dtype=np.uint8)
+            pread_into(fd, buffer, int(segy.offsets[block_start]))
+            raw = buffer.view(dtype)['data']
+            rows = samples[block_start - first:block_start - first + count]
+            if segy.format_code == 5:
+                rows[...] = raw.view(sample_dtype)  # Byteswap straight into the output
+            else:
+                rows[...] = decode_samples(raw, segy.format_code)
+        
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            for _ in executor.map(read_block, range(first, last, traces_per_block)):
+                pass
+    
+    return samples
+
+def binary_header_info(binary_header):
+    """
+    Extract sample interval, samples per trace and format code from a binary header
+    
+    Parameters:
+    binary_header (bytes): 400-byte binary file header
+    
+    Returns:
+    tuple: (sample_interval, num_samples, format_code)
+    """
+    sample_interval = struct.unpack('>H', binary_header[16:18])[0]
+    num_samples = struct.unpack('>H', binary_header[20:22])[0]
+    format_code = struct.unpack('>H', binary_header[24:26])[0]
+    
+    # SEG-Y rev2: a nonzero extended sample count (bytes 3269-3272)
+    # overrides the 16-bit one for traces longer than 65535 samples
+    if binary_header[300] >= 2:
+        num_samples = struct.unpack('>I', binary_header[68:72])[0] or num_samples
+    
+    return sample_interval, num_samples, format_code
+
+def data_start_offset(f, binary_header):
+    """
+    Byte offset of the first trace header, after any extended textual headers
+    
+    Bytes 3505-3506 hold the number of 3200-byte extended textual headers;
+    -1 (rev1) means a variable number ending with the header that holds the
+    ((SEG: EndText)) stanza, which is then searched for in the file.
+    
+    Parameters:
+    f (file): SEG-Y file opened in binary mode (its position is changed)
+    binary_header (bytes): 400-byte binary file header
+    
+    Returns:
+    int: Offset of the first trace header in bytes
+    """
+    count = struct.unpack('>h', binary_header[304:306])[0]
+    if count >= 0:
+        return 3600 + 3200 * count
+    if count != -1:
+        raise ValueError(f"Invalid number of extended textual headers: {count}")
+    
+    offset = 3600
+    while True:
+        f.seek(offset)
+        block = f.read(3200)
+        if len(block) < 3200:
+            raise ValueError("Extended textual headers end without a ((SEG: EndText)) stanza")
+        offset += 3200
+        # The stanza may be written in EBCDIC or ASCII
+        for text in (block, block.translate(EBCDIC_TO_ASCII)):
+            if b'((SEG: ENDTEXT))' in text.upper():
+                return offset
+
+def open_segy_memmap(file_path):
+    """
+    Map the samples of a fixed-length SEG-Y file without reading them
+    
+    The trace count follows from the file size, and only the pages of the
+    traces actually accessed are loaded from disk.
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    
+    Returns:
+    tuple: (ebcdic_header, binary_header, samples) where samples is a
+        read-only (traces, samples) big-endian array backed by the file, in
+        the file's own sample dtype (IBM and 3-byte formats cannot be mapped)
+    """
+    with open(file_path, 'rb') as f:
+        ebcdic_header = f.read(3200)
+        binary_header = f.read(400)
+        data_start = data_start_offset(f, binary_header)
+    
+    _, num_samples, format_code = binary_header_info(binary_header)
+    if struct.unpack('>H', binary_header[302:304])[0] != 1:
+        raise ValueError(f"{file_path} does not have the fixed-length trace flag set")
+    if not num_samples:
+        raise ValueError(f"{file_path} has no sample count in the binary header")
+    sample_dtype = SAMPLE_FORMATS.get(format_code, (None, None, None))[2]
+    if format_code == 1 or sample_dtype is None:
+        raise ValueError(f"Memory mapping is not supported for data format {format_code}")
+    
+    dtype = trace_record_dtype(num_samples, format_code)
+    num_traces = (os.path.getsize(file_path) - data_start) // dtype.itemsize
+    if num_traces <= 0:
+        return ebcdic_header, binary_header, np.empty((0, num_samples), dtype=sample_dtype)
+    
+    records = np.memmap(file_path, dtype=dtype, mode='r', offset=data_start, shape=(num_traces,))
+    return ebcdic_header, binary_header, records['data'].view(sample_dtype)
+
+def ebcdic_to_ascii(ebcdic_bytes):
+    """
+    EBCDIC (code page 037) to ASCII conversion for display purposes
+    
+    Characters without a printable ASCII equivalent are shown as '.'
+    """
+    result = bytes(ebcdic_bytes).translate(EBCDIC_TO_ASCII).decode('ascii')
     
     # Split into 80-character lines (EBCDIC card image format)
     lines = [result[i:i+80] for i in range(0, len(result), 80)]
     return "\n".join(lines)
 
-def ibm_to_float(bytes_data):
+def ibm_to_float(ibm_data):
     """
-    Convert IBM floating point format to IEEE floating point
+    Convert IBM System/360 floating point values to IEEE floating point
+    
+    Each 32-bit word holds a sign bit, a base-16 exponent biased by 64 and a
+    24-bit fraction: value = (-1)**sign * fraction / 2**24 * 16**(exponent - 64).
+    
+    Parameters:
+    ibm_data (bytes or numpy.ndarray): Big-endian IBM float bytes, or an
+        array of the raw 32-bit words
+    
+    Returns:
+    numpy.ndarray: float64 array of decoded values (IBM exponents exceed the
+        float32 range)
     """
-    # Simple implementation - for complete implementation, consider using a library
-    # or implementing the full IBM to IEEE conversion
-    try:
-        return struct.unpack('>f', bytes_data)[0]
-    except:
-        return 0.0
+    if isinstance(ibm_data, (bytes, bytearray, memoryview)):
+        ibm_data = np.frombuffer(ibm_data, dtype='>u4')
+    words = np.asarray(ibm_data).astype(np.uint32, copy=False)
+    
+    # The top byte (sign and exponent) selects a signed power-of-16 scale
+    return (words & 0x00ffffff) * IBM_SCALE[words >> 24]
 
-def plot_segy(traces, sample_interval=1000, filename=None):
+def decimate_traces(traces, max_traces=1000, max_samples=1000):
+    """
+    Reduce traces to a grid of at most max_traces x max_samples cells
+    
+    Each cell covers a run of neighbouring traces and samples and keeps
+    their minimum and maximum (an envelope), so peaks survive however far
+    the data is reduced. Traces are read a block at a time, so the full
+    data set is never copied.
+    
+    Parameters:
+    traces (list, numpy.ndarray or SegyFile): List of trace data arrays, a
+        2-D (traces, samples) array such as a memory map, or an open
+        SegyFile, whose traces are then decoded one block at a time
+    max_traces (int): Maximum number of cells across traces (default: 1000)
+    max_samples (int): Maximum number of cells along each trace (default: 1000)
+    
+    Returns:
+    tuple: (low, high, trace_step, sample_step) where low and high are
+        (samples, traces) arrays of cell minima and maxima (nan where a cell
+        holds no samples) and the steps are the cell size in traces and samples
+    """
+    num_traces = len(traces)
+    if isinstance(traces, SegyFile):
+        num_samples = int(traces.trace_samples.max(initial=0))
+    else:
+        num_samples = max(len(trace) for trace in traces) if num_traces else 0
+    trace_step = max(1, -(-num_traces // max_traces))
+    sample_step = max(1, -(-num_samples // max_samples))
+    cells_across = -(-num_traces // trace_step)
+    cells_down = -(-num_samples // sample_step)
+    low = np.full((cells_down, cells_across), np.nan)
+    high = np.full((cells_down, cells_across), np.nan)
+    
+    # Whole cells of traces per block
+    cells_per_block = max(1, TRACE_BLOCK_BYTES // (8 * trace_step * max(cells_down * sample_step, 1)))
+    for first_cell in range(0, cells_across, cells_per_block):
+        last_cell = min(first_cell + cells_per_block, cells_across)
+        start = first_cell * trace_step
+        stop = min(last_cell * trace_step, num_traces)
+        
+        # Pad the block with nan to whole cells
+        block = np.full(((last_cell - first_cell) * trace_step, cells_down * sample_step), np.nan)
+        if isinstance(traces, np.ndarray):
+            block[:stop - start, :num_samples] = traces[start:stop]
+        else:
+            for i, trace in enumerate(traces[start:stop]):
+                block[i, :len(trace)] = trace
+        
+        cells = block.reshape(last_cell - first_cell, trace_step, cells_down, sample_step)
+        low[:, first_cell:last_cell] = np.fmin.reduce(cells, axis=(1, 3)).T
+        high[:, first_cell:last_cell] = np.fmax.reduce(cells, axis=(1, 3)).T
+    
+    return low, high, trace_step, sample_step
+
+def plot_segy(traces, sample_interval=1000, filename=None, fill=False, output_file=None, figsize=(10, 6)):
     """
     Plot SEG-Y trace data
     
+    The data is first reduced to the pixel size of the figure with
+    decimate_traces, so the time spent drawing depends on the figure size
+    rather than on the number of traces and samples.
+    
     Parameters:
-    traces (list): List of trace data arrays
+    traces (list, numpy.ndarray or SegyFile): List of trace data arrays, a
+        2-D (traces, samples) array such as a memory map, or an open SegyFile
     sample_interval (int): Sample interval in microseconds
     filename (str): Original filename for the plot title
+    fill (bool): Shade the positive lobes of wiggle traces (default: False)
+    output_file (str): Save the figure to this image file instead of
+        showing it (default: show)
+    figsize (tuple): Figure size in inches (default: (10, 6))
     """
-    if not traces:
+    if len(traces) == 0:
         print("No traces to plot")
         return
     
-    # Create time axis in milliseconds
-    time_axis = np.arange(0, len(traces[0]) * sample_interval / 1000, sample_interval / 1000)
+    # Imported here so that reading and exporting work without a display
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection, PolyCollection
     
     # Create figure
-    plt.figure(figsize=(10, 6))
+    fig = plt.figure(figsize=figsize)
+    width, height = fig.get_size_inches() * fig.dpi
+    
+    # Reduce the data to the pixel grid of the figure
+    low, high, trace_step, sample_step = decimate_traces(traces, int(width), int(height))
+    peaks = np.where(high >= -low, high, low)
+    if peaks.size == 0:
+        print("No samples to plot")
+        plt.close(fig)
+        return
+    
+    # Create time axis in milliseconds, one entry per decimated sample
+    dt = sample_interval / 1000
+    time_axis = np.arange(len(peaks)) * sample_step * dt
     
     # Decide what to plot based on number of traces
     if len(traces) == 1:
         # Single trace - plot amplitude vs time
-        plt.plot(time_axis, traces[0])
+        if sample_step > 1:
+            plt.fill_between(time_axis, low[:, 0], high[:, 0], linewidth=0.5)
+        else:
+            plt.plot(time_axis, peaks[:, 0])
         plt.xlabel('Time (ms)')
         plt.ylabel('Amplitude')
         plt.title(f'SEG-Y Trace Data - {filename or ""}')
         plt.grid(True)
     else:
         # Multiple traces - create wiggle plot or image
-        if len(traces) <= 50:
-            # Wiggle plot for a reasonable number of traces
-            for i, trace in enumerate(traces):
-                # Normalize and offset each trace
-                normalized = trace / (np.max(np.abs(trace)) or 1) * 0.5
-                plt.plot(normalized + i, time_axis, 'k-', linewidth=0.5)
-            plt.gca().invert_yaxis()  # Invert Y axis (time increases downward)
+        if len(traces) <= WIGGLE_MAX_TRACES:
+            # Wiggle plot, every trace normalized and offset at once and
+            # drawn as a single collection
+            scale = np.nanmax(np.abs(peaks), axis=0)
+            normalized = peaks / np.where(scale > 0, scale, 1) * 0.5
+            offsets = np.arange(peaks.shape[1]) * trace_step
+            x = normalized.T + offsets[:, None]
+            y = np.broadcast_to(time_axis, x.shape)
+            ax = plt.gca()
+            if fill:
+                # Variable area: shade the positive lobes against each trace's baseline
+                lobes = np.nan_to_num(np.clip(normalized.T, 0, None)) + offsets[:, None]
+                polygons = np.concatenate([np.stack([lobes, y], axis=-1),
+                                           np.stack([np.broadcast_to(offsets[:, None], x.shape), y],
+                                                    axis=-1)[:, ::-1]], axis=1)
+                ax.add_collection(PolyCollection(polygons, facecolors='k', edgecolors='none'))
+            ax.add_collection(LineCollection(np.stack([x, y], axis=-1), colors='k', linewidths=0.5))
+            ax.set_xlim(-1, offsets[-1] + 1)
+            ax.set_ylim(time_axis[-1], time_axis[0])  # Time increases downward
             plt.xlabel('Trace Number')
             plt.ylabel('Time (ms)')
             plt.title(f'SEG-Y Wiggle Plot - {filename or ""}')
             plt.grid(True)
         else:
             # Image plot for many traces
-            data_matrix = np.array(traces).T  # Transpose for proper orientation
-            plt.imshow(data_matrix, aspect='auto', cmap='seismic', 
-                       extent=[0, len(traces), time_axis[-1], time_axis[0]])
+            plt.imshow(peaks, aspect='auto', cmap='seismic', interpolation='nearest',
+                       extent=[0, len(traces), len(peaks) * sample_step * dt, 0])
             plt.colorbar(label='Amplitude')
             plt.xlabel('Trace Number')
             plt.ylabel('Time (ms)')
             plt.title(f'SEG-Y Image Plot - {filename or ""}')
     
     plt.tight_layout()
-    plt.show()
+    if output_file:
+        fig.savefig(output_file)
+        plt.close(fig)
+    else:
+        plt.show()
 
-def save_to_csv(traces, output_file, sample_interval=1000):
+def find_segy_files(inputs):
+    """
+    Resolve paths, glob patterns and directories to a list of SEG-Y files
+    
+    Parameters:
+    inputs (list): Paths, glob patterns or directories; directories
+        contribute the .sgy and .segy files they contain
+    
+    Returns:
+    list: Sorted, de-duplicated file paths
+    """
+    files = set()
+    for pattern in inputs:
+        for path in glob.glob(pattern) or [pattern]:
+            if os.path.isdir(path):
+                for name in os.listdir(path):
+                    entry = os.path.join(path, name)
+                    if os.path.isfile(entry) and name.lower().endswith(('.sgy', '.segy')):
+                        files.add(entry)
+            else:
+                files.add(path)
+    return sorted(files)
+
+def render_thumbnail(task):
+    """
+    Render the plot of one SEG-Y file to a PNG in a batch worker
+    
+    Parameters:
+    task (tuple): (file_path, output_file)
+    
+    Returns:
+    tuple: (file_path, output_file, error message or None)
+    """
+    file_path, output_file = task
+    try:
+        # Render off-screen; must be selected before pyplot is imported
+        import matplotlib
+        matplotlib.use('Agg')
+        
+        # Traces are decoded a block at a time while decimating, so IBM and
+        # variable-length files are never held in memory as a whole
+        with SegyFile(file_path) as segy:
+            if not len(segy) or not segy.trace_samples.max():
+                return file_path, output_file, "no samples to plot"
+            plot_segy(segy, segy.sample_interval, os.path.basename(file_path),
+                      output_file=output_file, figsize=THUMBNAIL_FIGSIZE)
+    except Exception as e:
+        return file_path, output_file, str(e)
+    return file_path, output_file, None
+
+def render_thumbnails(file_paths, output_dir, workers=None):
+    """
+    Render PNG thumbnails of many SEG-Y files on a process pool, without a display
+    
+    Raises ValueError before rendering anything if two files would be
+    written to the same thumbnail.
+    
+    Parameters:
+    file_paths (list): Paths to the SEG-Y files
+    output_dir (str): Directory for the <name>.png thumbnails
+    workers (int): Number of worker processes (default: one per CPU)
+    
+    Returns:
+    int: Number of files that failed to render
+    """
+    tasks = [(file_path, os.path.join(output_dir, os.path.splitext(os.path.basename(file_path))[0] + '.png'))
+             for file_path in file_paths]
+    
+    # Files differing only in directory or extension would overwrite each other's thumbnail
+    outputs = collections.Counter(os.path.abspath(task[1]) for task in tasks)
+    clashes = sorted(path for path, count in outputs.items() if count > 1)
+    if clashes:
+        raise ValueError(f"Several files would be rendered to the same thumbnail: {', '.join(clashes)}")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    workers = workers or os.cpu_count() or 1
+    # Hand out several files per round trip to amortize IPC overhead
+    chunksize = max(1, min(16, len(tasks) // (workers * 4)))
+    
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_path, output_file, error in executor.map(render_thumbnail, tasks, chunksize=chunksize):
+            if error:
+                failed += 1
+                print(f"Error: {file_path}: {error}")
+            else:
+                print(f"{file_path} -> {output_file}")
+    elapsed = time.perf_counter() - start
+    
+    print(f"Rendered {len(tasks) - failed} of {len(tasks)} files in {elapsed:.2f} s "
+          f"({len(tasks) / elapsed if elapsed else 0:.1f} files/s, {workers} workers)")
+    return failed
+
+def save_to_csv(traces, output_file, sample_interval=1000, block_samples=4096):
     """
     Save trace data to CSV file
     
+    Rows are rendered a block of time samples at a time with np.savetxt
+    instead of one csv.writer call per row; shorter traces are padded with nan.
+    Times are written as exact decimals and samples exact in float32 with
+    9 significant digits, all other samples with 17.
+    
     Parameters:
-    traces (list): List of trace data arrays
+    traces (list or numpy.ndarray): List of trace data arrays, or a 2-D
+        (traces, samples) array
     output_file (str): Output CSV file path
     sample_interval (int): Sample interval in microseconds
+    block_samples (int): Number of time samples formatted per block (default: 4096)
     """
-    # Create time axis in milliseconds
-    time_axis = np.arange(0, len(traces[0]) * sample_interval / 1000, sample_interval / 1000)
+    num_traces = len(traces)
+    num_samples = max(len(trace) for trace in traces) if num_traces else 0
+    
+    # '%s' prints each time in shortest round-trip form, which is the exact
+    # decimal of k * sample_interval / 1000. Samples not exact in float32
+    # (e.g. decoded from float64 or 32-bit integers) get 17 significant
+    # digits so that no value is rounded
+    with np.errstate(over='ignore'):  # Values beyond float32 are simply not exact
+        exact = all(np.can_cast(np.asarray(trace).dtype, np.float32) or
+                    np.array_equal(np.asarray(trace, dtype=np.float32), trace, equal_nan=True)
+                    for trace in traces)
+    fmt = ['%s'] + ['%.9g' if exact else '%.17g'] * num_traces
     
     # Open output file
     with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
+        # Write header
+        header = ['Time (ms)'] + [f'Trace {i+1}' for i in range(num_traces)]
+        f.write(','.join(header) + '\r\n')
         
+        # Write data, one block of rows at a time
+        for start in range(0, num_samples, block_samples):
+            stop = min(start + block_samples, num_samples)
+            block = np.full((stop - start, num_traces + 1), np.nan)
+            
+            # Time axis in milliseconds
+            block[:, 0] = np.arange(start, stop) * sample_interval / 1000
+            if isinstance(traces, np.ndarray):
+                block[:, 1:] = traces[:, start:stop].T
+            else:
+                for i, trace in enumerate(traces):
+                    part = trace[start:stop]
+                    block[:len(part), i + 1] = part
+            
+            np.savetxt(f, block, fmt=fmt, delimiter=',', newline='\r\n')
+    
+    print(f"Data saved to {output_file}")
+
+def export_segy_to_csv(file_path, output_file, block_bytes=CSV_BLOCK_BYTES):
+    """
+    Stream the traces of a fixed-length SEG-Y file to CSV in constant memory
+    
+    The rows of a CSV file run across all traces, so the data is transposed
+    on disk in two passes. The first reads contiguous blocks of whole
+    traces and appends each block, transposed to sample-major order, to a
+    temporary file next to the output. The second reads, for a window of
+    rows, one contiguous run from every block and writes the rows. Both
+    passes read and write in large sequential pieces (the runs of the
+    second pass are about block_bytes**2 / data size bytes), so files
+    larger than RAM are exported without re-reading pages. The temporary
+    file is as large as the decoded samples. The output matches save_to_csv.
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    output_file (str): Output CSV file path
+    block_bytes (int): Approximate memory used per block (default: CSV_BLOCK_BYTES)
+    
+    Returns:
+    tuple: (num_samples, num_traces) written
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(3200)
+        binary_header = f.read(400)
+        data_start = data_start_offset(f, binary_header)
+    
+    sample_interval, num_samples, format_code = binary_header_info(binary_header)
+    if struct.unpack('>H', binary_header[302:304])[0] != 1:
+        raise ValueError(f"{file_path} does not have the fixed-length trace flag set")
+    if not num_samples:
+        raise ValueError(f"{file_path} has no sample count in the binary header")
+    
+    dtype = trace_record_dtype(num_samples, format_code)
+    num_traces = max((os.path.getsize(file_path) - data_start) // dtype.itemsize, 0)
+    value_dtype = decoded_dtype(format_code)
+    
+    # Traces per block: raw bytes, decoded float64 and transposed samples
+    trace_bytes = max(num_samples, 1) * (sample_size(format_code) + 8 + value_dtype.itemsize)
+    traces_per_block = max(1, min(block_bytes // trace_bytes, num_traces))
+    # Rows per window: the samples read back and the output block
+    window_samples = max(1, block_bytes // ((value_dtype.itemsize + 8) * (num_traces + 1)))
+    
+    with open(output_file, 'w', newline='') as f:
         # Write header
-        header = ['Time (ms)'] + [f'Trace {i+1}' for i in range(len(traces))]
-        writer.writerow(header)
+        header = ['Time (ms)'] + [f'Trace {i+1}' for i in range(num_traces)]
+        f.write(','.join(header) + '\r\n')
+        if num_traces == 0:
+            print(f"Data saved to {output_file}")
+            return num_samples, 0
         
-        # Write data
-        for i, time in enumerate(time_axis):
-            row = [time] + [trace[i] for trace in traces]
-            writer.writerow(row)
+        exact = True
+        with open(file_path, 'rb') as segy, \
+                tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(output_file))) as transposed:
+            # Pass 1: contiguous blocks of traces, each stored sample-major
+            segy.seek(data_start)
+            for start in range(0, num_traces, traces_per_block):
+                count = min(traces_per_block, num_traces - start)
+                records = np.frombuffer(segy.read(count * dtype.itemsize), dtype=dtype)
+                values = decode_samples(records['data'], format_code)
+                transposed.write(values.T.astype(value_dtype, order='C').tobytes())
+                
+                # Same digits as save_to_csv: 9 if every value is exact in float32
+                if exact and format_code not in FLOAT32_EXACT_FORMATS:
+                    with np.errstate(over='ignore'):
+                        exact = np.array_equal(values.astype(np.float32), values, equal_nan=True)
+            fmt = ['%s'] + ['%.9g' if exact else '%.17g'] * num_traces
+            
+            # Pass 2: a window of rows at a time, one run per block of traces
+            block = np.empty((window_samples, num_traces + 1))
+            for first in range(0, num_samples, window_samples):
+                last = min(first + window_samples, num_samples)
+                rows = block[:last - first]
+                
+                # Time axis in milliseconds
+                rows[:, 0] = np.arange(first, last) * sample_interval / 1000
+                for start in range(0, num_traces, traces_per_block):
+                    count = min(traces_per_block, num_traces - start)
+                    transposed.seek(value_dtype.itemsize * (start * num_samples + first * count))
+                    run = np.frombuffer(transposed.read(value_dtype.itemsize * (last - first) * count),
+                                        dtype=value_dtype)
+                    rows[:, 1 + start:1 + start + count] = run.reshape(last - first, count)
+                
+                np.savetxt(f, rows, fmt=fmt, delimiter=',', newline='\r\n')
     
     print(f"Data saved to {output_file}")
+    return num_samples, num_traces
+
+def trace_array(file_path):
+    """
+    Get the samples of every trace as one (traces, samples) array
+    
+    Fixed-length files in a mappable format return the memory map from
+    open_segy_memmap, so nothing is read or converted up front. Other
+    fixed-length files are decoded with read_trace_range, and
+    variable-length files are padded with nan to the longest trace, both
+    to the float dtype given by decoded_dtype.
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    
+    Returns:
+    tuple: (sample_interval, samples)
+    """
+    try:
+        _, binary_header, samples = open_segy_memmap(file_path)
+        return binary_header_info(binary_header)[0], samples
+    except ValueError:
+        pass
+    
+    with SegyFile(file_path) as segy:
+        if segy.fixed_length and segy.num_samples:
+            return segy.sample_interval, read_trace_range(file_path)
+        
+        samples = np.full((len(segy), int(segy.trace_samples.max(initial=0))), np.nan,
+                          dtype=decoded_dtype(segy.format_code))
+        for i in range(len(segy)):
+            trace = segy[i]
+            samples[i, :len(trace)] = trace
+        return segy.sample_interval, samples
+
+def export_segy_arrays(file_path, output_file, kind='npy', trace_data=None):
+    """
+    Export trace samples and decoded trace headers in a binary format
+    
+    'npy' and 'npz' keep the sample dtype of memory-mapped files (e.g.
+    big-endian '>f4'), so the samples are streamed from the file without
+    conversion and the output opens instantly with np.load(mmap_mode='r').
+    'f32' is raw little-endian float32 with no header, written a block of
+    traces at a time; 4-byte integer and float64 samples are rounded, and
+    IBM values beyond the float32 range become inf or 0. For 'npy' and 'f32' the headers go to a
+    <name>_headers.npy file next to the output; 'npz' holds the arrays
+    'traces', 'headers' and 'sample_interval'.
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    output_file (str): Output file path
+    kind (str): 'npy', 'npz' or 'f32' (default: 'npy')
+    trace_data (tuple): (sample_interval, samples) already returned by
+        trace_array for this file (default: call trace_array)
+    """
+    if kind not in ('npy', 'npz', 'f32'):
+        raise ValueError(f"Unknown export format {kind!r}")
+    
+    sample_interval, samples = trace_data or trace_array(file_path)
+    headers = read_trace_headers(file_path)
+    
+    if kind == 'npz':
+        np.savez(output_file, traces=samples, headers=headers, sample_interval=np.int32(sample_interval))
+    else:
+        if kind == 'npy':
+            np.save(output_file, samples)
+        else:
+            rows = max(1, TRACE_BLOCK_BYTES // max(samples.shape[1] * 4, 1))
+            with open(output_file, 'wb') as f:
+                for start in range(0, len(samples), rows):
+                    samples[start:start + rows].astype('<f4').tofile(f)
+        np.save(os.path.splitext(output_file)[0] + '_headers.npy', headers)
+    
+    print(f"Data saved to {output_file}")
+
+def print_header_summary(file_path):
+    """
+    Print trace count and key header ranges from a header-only scan
+    
+    The scan is cached in the sidecar index, so repeated runs on an
+    unchanged file skip it.
+    
+    Parameters:
+    file_path (str): Path to the SEG-Y file
+    """
+    start = time.perf_counter()
+    with SegyFile(file_path, index=True) as segy:
+        columns = segy.header_columns
+        num_traces = len(segy)
+    elapsed = time.perf_counter() - start
+    
+    print(f"File: {file_path}")
+    print(f"Number of traces: {num_traces} (scanned in {elapsed:.2f} s)")
+    if not num_traces:
+        return
+    for name in INDEX_COLUMNS:
+        column = columns[name]
+        print(f"{name}: {column.min()} - {column.max()} ({len(np.unique(column))} distinct)")
 
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Read and display SEG-Y files')
-    parser.add_argument('file', help='Path to the SEG-Y file')
+    parser.add_argument('file', nargs='+',
+                        help='Path to the SEG-Y file (several files, globs or directories with --thumbnails)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Print detailed information')
     parser.add_argument('-c', '--csv', help='Save to CSV file')
-    parser.add_argument('-p', '--plot', action='store_true', default=True, help='Plot the trace data')
+    parser.add_argument('--npy', help='Save traces to a .npy file (headers to <name>_headers.npy)')
+    parser.add_argument('--npz', help='Save traces, headers and sample interval to a .npz file')
+    parser.add_argument('--f32', help='Save traces as raw little-endian float32 (headers to <name>_headers.npy)')
+    parser.add_argument('--scan', action='store_true',
+                        help='Only scan the trace headers and print a geometry summary (no sample data is read)')
+    parser.add_argument('--fill', action='store_true', help='Shade the positive lobes of wiggle traces')
+    parser.add_argument('-p', '--plot', action=argparse.BooleanOptionalAction, default=True,
+                        help='Plot the trace data (default: on; --no-plot to skip)')
+    parser.add_argument('--thumbnails', metavar='DIR',
+                        help='Render a PNG preview of every input file into DIR without a display')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of worker processes for --thumbnails (default: one per CPU)')
     
     args = parser.parse_args()
     
+    # Headless batch rendering
+    if args.thumbnails:
+        try:
+            render_thumbnails(find_segy_files(args.file), args.thumbnails, args.workers)
+        except ValueError as e:
+            print(f"Error: {e}")
+        return
+    
+    if len(args.file) > 1:
+        parser.error("only one file can be read at a time (use --thumbnails for several)")
+    args.file = args.file[0]
+    
+    # Header-only scan
+    if args.scan:
+        try:
+            print_header_summary(args.file)
+        except Exception as e:
+            print(f"Error: {e}")
+        return
+    
     # Read the SEG-Y file
     try:
-        _, binary_header, traces = read_segy_file(args.file, args.verbose)
-        
-        # Extract sample interval from binary header
-        sample_interval = struct.unpack('>H', binary_header[16:18])[0]
-        
-        # Always output basic information
-        print(f"File: {args.file}")
-        print(f"Number of traces: {len(traces)}")
-        if traces:
-            print(f"Samples per trace: {len(traces[0])}")
-            print(f"Sample interval: {sample_interval} microseconds")
-        
-        # Save to CSV if requested
-        if args.csv:
-            import csv
-            save_to_csv(traces, args.csv, sample_interval)
-        
-        # Plot if requested
-        if args.plot:
-            plot_segy(traces, sample_interval, os.path.basename(args.file))
+        with SegyFile(args.file) as segy:
+            segy.check_complete()
+            if args.verbose:
+                print_segy_details(segy)
+            sample_interval = segy.sample_interval
+            
+            # Always output basic information
+            print(f"File: {args.file}")
+            print(f"Number of traces: {len(segy)}")
+            if len(segy):
+                print(f"Samples per trace: {segy.trace_samples[0]}")
+                print(f"Sample interval: {sample_interval} microseconds")
+            
+            # Samples are only loaded for the outputs that need them all at once
+            trace_data = None
+            
+            # Save to CSV if requested
+            if args.csv:
+                # Fixed-length files are streamed from disk a block at a time
+                if segy.fixed_length and segy.num_samples:
+                    export_segy_to_csv(args.file, args.csv)
+                else:
+                    trace_data = trace_array(args.file)
+                    save_to_csv(trace_data[1], args.csv, sample_interval)
+            
+            # Binary exports, sharing one copy of the samples
+            for kind in ('npy', 'npz', 'f32'):
+                if getattr(args, kind):
+                    trace_data = trace_data or trace_array(args.file)
+                    export_segy_arrays(args.file, getattr(args, kind), kind, trace_data)
+            
+            # Plot if requested, reading only the decimated samples
+            if args.plot:
+                plot_segy(segy, sample_interval, os.path.basename(args.file), args.fill)
         
     except Exception as e:
         print(f"Error: {e}")
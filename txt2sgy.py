@@ -1,44 +1,131 @@
 import numpy as np
 import os
 import struct
+import itertools
+import warnings
+import glob
+import time
+import collections
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import csv  # Importing the csv module
 import argparse  # For command line arguments
 
-def read_text_data(file_path):
+# Translation tables between Latin-1 and EBCDIC code page 037 for the
+# textual header; decoding shows non-printable characters as '.'
+ASCII_TO_EBCDIC = bytes(range(256)).decode('latin-1').encode('cp037')
+EBCDIC_TO_ASCII = bytes(ord(c) if ' ' <= c <= '~' else ord('.')
+                        for c in bytes(range(256)).decode('cp037'))
+
+def parse_text_lines(lines, is_csv=False, engine='numpy'):
     """
-    Read a text file with one sample per line or a CSV file with Time and Value columns
+    Convert a list of text or CSV lines to float32 samples
+    
+    Parameters:
+    lines (list): Lines of the input file (without the CSV header)
+    is_csv (bool): Whether the lines are Time,Value CSV rows
+    engine (str): 'numpy' for NumPy's compiled text loader, 'python' for the
+        per-line float() parser that tolerates short or ragged rows
+    
+    Returns:
+    numpy.ndarray: float32 array of the parsed samples
     """
-    if file_path.endswith('.csv'):
-        # Read CSV file
-        with open(file_path, 'r') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            samples = [float(row[1]) for row in reader if row and len(row) > 1]
+    if engine == 'numpy':
+        # Parse in double precision like float() does, then narrow
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # All-blank chunk
+            samples = np.loadtxt(lines, dtype=np.float64, comments=None,
+                                 delimiter=',' if is_csv else None,
+                                 usecols=1 if is_csv else None).reshape(-1)
+        # Several values on a line would otherwise pass as extra samples
+        if len(samples) != sum(1 for line in lines if line.strip()):
+            raise ValueError("Expected one sample per line")
+        return samples.astype(np.float32)
+    
+    if is_csv:
+        values = (float(row[1]) for row in csv.reader(lines) if row and len(row) > 1)
     else:
-        # Read text file
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
+        values = (float(line) for line in lines if line.strip())
+    return np.fromiter(values, dtype=np.float32)
+
+def iter_text_blocks(file_path, block_size=65536, engine='auto'):
+    """
+    Parse a text file with one sample per line or a CSV file with Time and
+    Value columns in bounded-size blocks
+    
+    With engine='auto' every block goes through NumPy's compiled loader until
+    one fails to parse; that block and the rest of the file then fall back to
+    the per-line Python parser.
+    
+    Parameters:
+    file_path (str): Path to the input text or CSV file
+    block_size (int): Maximum number of lines per block (default: 65536)
+    engine (str): 'auto', 'numpy' or 'python' (default: 'auto')
+    
+    Yields:
+    numpy.ndarray: float32 array of at most block_size samples
+    """
+    is_csv = file_path.endswith('.csv')
+    with open(file_path, 'r') as f:
+        if is_csv:
+            next(f, None)  # Skip header
         
-        # Convert lines to float values
-        samples = [float(line.strip()) for line in lines if line.strip()]
+        while True:
+            lines = list(itertools.islice(f, block_size))
+            if not lines:
+                break
+            
+            if engine == 'auto':
+                try:
+                    block = parse_text_lines(lines, is_csv, 'numpy')
+                except ValueError:
+                    engine = 'python'
+            if engine != 'auto':
+                block = parse_text_lines(lines, is_csv, engine)
+            
+            if len(block):
+                yield block
+
+def read_text_data(file_path):
+    """
+    Read a text file with one sample per line or a CSV file with Time and Value columns
     
-    return np.array(samples)
+    Returns:
+    numpy.ndarray: float32 array of all samples
+    """
+    return np.concatenate([np.empty(0, dtype=np.float32), *iter_text_blocks(file_path)])
 
-def create_segy_file(input_file, output_file, sample_interval=2000):
+def create_segy_file(input_file, output_file, sample_interval=2000, split_samples=None, format_code=5):
     """
     Convert text file with amplitude values to SEG-Y format
     
     Parameters:
-    input_file (str): Path to the input text or CSV file
+    input_file (str or numpy.ndarray): Path to the input text or CSV file, or a
+        1-D trace / 2-D samples x traces matrix of amplitudes
     output_file (str): Path to the output SEG-Y file
     sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    split_samples (int): Split text input into consecutive traces of at most
+        this many samples (default: one trace)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
     """
-    # Read the sample data
-    data = read_text_data(input_file)
+    # Text input is streamed block by block straight into the trace
+    if not isinstance(input_file, np.ndarray):
+        num_samples, num_traces = stream_segy_file(input_file, output_file, sample_interval,
+                                                   split_samples=split_samples, format_code=format_code)
+        print(f"Successfully converted {input_file} to SEG-Y format: {output_file}")
+        print(f"Number of samples: {num_samples}")
+        if num_traces > 1:
+            print(f"Number of traces: {num_traces}")
+        return
     
-    # Get number of samples
-    num_samples = len(data)
+    # Treat a single trace as a one-column matrix
+    data = input_file
+    input_ndim = data.ndim
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+    
+    # Get number of samples and traces
+    num_samples, num_traces = data.shape
     
     # Create output file
     with open(output_file, 'wb') as f:
@@ -47,75 +134,221 @@ def create_segy_file(input_file, output_file, sample_interval=2000):
         f.write(ebcdic_header)
         
         # Write Binary header (400 bytes)
-        binary_header = create_binary_header(num_samples, sample_interval)
+        binary_header = create_binary_header(num_samples, sample_interval, format_code=format_code)
         f.write(binary_header)
         
-        # Write trace data
-        write_trace(f, data, sample_interval)
+        # Write trace headers and data
+        write_traces(f, data, sample_interval, format_code)
     
-    print(f"Successfully converted {input_file} to SEG-Y format: {output_file}")
+    print(f"Successfully converted {input_ndim}-D sample array to SEG-Y format: {output_file}")
     print(f"Number of samples: {num_samples}")
+    if num_traces > 1:
+        print(f"Number of traces: {num_traces}")
 
-def create_ebcdic_header():
+def stream_segy_file(input_file, output_file, sample_interval=2000, block_size=65536, split_samples=None,
+                     format_code=5):
     """
-    Create EBCDIC header (3200 bytes)
+    Convert a text or CSV file to a SEG-Y file in bounded memory
+    
+    Samples are encoded and written as each parsed block arrives; the sample
+    counts in the headers are filled in once the input is exhausted. By
+    default the whole input becomes one trace; with split_samples it is cut
+    into consecutive traces of that length, the last one possibly shorter.
+    A shorter last trace has to fit the 65535-sample limit of the trace
+    header; otherwise ValueError is raised and no output is written.
+    
+    Parameters:
+    input_file (str): Path to the input text or CSV file
+    output_file (str): Path to the output SEG-Y file
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    block_size (int): Maximum number of lines parsed at a time (default: 65536)
+    split_samples (int): Maximum number of samples per trace (default: no limit)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    
+    Returns:
+    tuple: (total number of samples, number of traces)
     """
-    # Create a header with spaces (ASCII 32)
-    header = bytearray([64] * 3200)  # 64 is EBCDIC for space
-    
-    # Add some basic information (in EBCDIC)
-    now = datetime.now()
-    date_str = now.strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Convert ASCII to EBCDIC (simplified)
-    header_text = f"C01 CONVERTED FROM TEXT FILE {date_str}"
-    
-    # Simple ASCII to EBCDIC conversion for basic text
-    for i, char in enumerate(header_text[:80]):
-        # Very simplified ASCII to EBCDIC mapping for common characters
-        if ord(char) == 32:  # space
-            header[i] = 64
-        elif 48 <= ord(char) <= 57:  # numbers 0-9
-            header[i] = ord(char) + 192
-        elif 65 <= ord(char) <= 90:  # uppercase A-Z
-            header[i] = ord(char) + 128
-        elif 97 <= ord(char) <= 122:  # lowercase a-z (convert to uppercase in EBCDIC)
-            header[i] = ord(char) - 32 + 128
-        elif char == '-':
-            header[i] = 96
-        elif char == ':':
-            header[i] = 122
+    if split_samples is not None and split_samples < 1:
+        raise ValueError(f"split_samples must be at least 1, got {split_samples}")
+    
+    num_samples = 0
+    num_traces = 1
+    trace_samples = 0
+    
+    # Write to a temporary file so that a failed conversion leaves no partial output
+    tmp_file = output_file + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            # Write headers with a placeholder sample count
+            f.write(create_ebcdic_header())
+            f.write(create_binary_header(0, sample_interval, format_code=format_code))
+            trace_start = f.tell()
+            f.write(create_trace_header(split_samples or 0, sample_interval, num_traces))
+        
+            # Write trace data samples as they are parsed
+            for block in iter_text_blocks(input_file, block_size):
+                while len(block):
+                    # Start the next trace once the current one is full
+                    if trace_samples == split_samples:
+                        num_traces += 1
+                        trace_samples = 0
+                        trace_start = f.tell()
+                        f.write(create_trace_header(split_samples, sample_interval, num_traces))
+                
+                    count = len(block) if not split_samples else min(len(block), split_samples - trace_samples)
+                    f.write(encode_samples(block[:count], format_code).tobytes())
+                    trace_samples += count
+                    num_samples += count
+                    block = block[count:]
+        
+            # A shorter last trace needs its own count in bytes 115-116, which
+            # cannot hold more than 65535 samples
+            if num_traces > 1 and 65535 < trace_samples < split_samples:
+                raise ValueError(f"The last trace has {trace_samples} samples, more than a trace header "
+                                 f"can record; choose a split that divides the {num_samples} samples "
+                                 f"or is at most 65535")
             
-    return bytes(header)
+            # Rewrite the last trace header and the binary header now that the
+            # sample counts are known
+            f.seek(trace_start)
+            f.write(create_trace_header(trace_samples, sample_interval, num_traces))
+            trace_length = split_samples if num_traces > 1 else trace_samples
+            f.seek(3200)
+            f.write(create_binary_header(trace_length, sample_interval, trace_samples == trace_length, format_code))
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, output_file)
+    
+    return num_samples, num_traces
 
-def create_binary_header(num_samples, sample_interval=2000):
+def float_to_ibm(values):
+    """
+    Convert IEEE floating point values to IBM System/360 floating point words
+    
+    Values are taken as float32 and converted with integer bit operations:
+    the 24-bit significand is shifted right by 0-3 bits, rounding to nearest
+    even, so that the binary exponent becomes a multiple of 4, i.e. a base-16
+    exponent. Every finite float32 fits the IBM range; infinities saturate
+    and NaN becomes zero.
+    
+    Parameters:
+    values (numpy.ndarray): Array of floating point values
+    
+    Returns:
+    numpy.ndarray: uint32 array of IBM float words
+    """
+    with np.errstate(over='ignore'):  # Out-of-range doubles become inf
+        bits = np.ascontiguousarray(values, dtype=np.float32).view(np.uint32)
+    sign = bits & 0x80000000
+    exponent = ((bits >> 23) & 0xff).astype(np.int32)
+    significand = bits & 0x007fffff
+    
+    # value = significand / 2**24 * 2**binary_exponent, with the implicit
+    # leading bit restored for normal numbers
+    normal = exponent != 0
+    significand |= normal.astype(np.uint32) << 23
+    binary_exponent = exponent + ~normal - 126
+    
+    # Normalize subnormal significands so they keep their full precision
+    subnormal = ~normal & (significand != 0)
+    if subnormal.any():
+        lead = 24 - np.frexp(significand[subnormal])[1]
+        significand[subnormal] <<= lead.astype(np.uint32)
+        binary_exponent[subnormal] -= lead
+    
+    # Round the exponent up to a multiple of 4 and shift the significand to
+    # match, rounding the dropped bits half to even
+    exponent16 = (binary_exponent + 3) >> 2
+    shift = (4 * exponent16 - binary_exponent).astype(np.uint32)
+    half = (np.uint32(1) << shift) >> 1
+    shifted = (shift + 3) >> 2  # 1 where any bits are dropped
+    mantissa = (significand + half - shifted + ((significand >> shift) & shifted)) >> shift
+    
+    words = sign | ((exponent16 + 64).astype(np.uint32) << 24) | mantissa
+    words[significand == 0] = 0
+    
+    # Infinities saturate to the largest IBM magnitude, NaN becomes zero
+    special = exponent == 255
+    words[special] = np.where(significand[special] == 0x00800000, sign[special] | 0x7fffffff, 0)
+    return words
+
+def encode_samples(data, format_code=5):
+    """
+    Encode samples as big-endian 4-byte values for the given format code
+    
+    Parameters:
+    data (numpy.ndarray): Array of samples
+    format_code (int): 5 = IEEE floating-point, 1 = IBM floating-point (default: 5)
+    
+    Returns:
+    numpy.ndarray: '>f4' array for IEEE or '>u4' array of IBM words
+    """
+    if format_code == 1:
+        return float_to_ibm(data).astype('>u4')
+    if format_code == 5:
+        return np.asarray(data, dtype='>f4')
+    raise ValueError(f"Unsupported output data format {format_code}")
+
+def create_ebcdic_header(lines=None):
+    """
+    Create EBCDIC header (3200 bytes)
+    
+    Parameters:
+    lines (list): Text of up to 40 80-column cards, without the "Cnn " prefix
+        (default: conversion date on C01 and END TEXTUAL HEADER on C40)
+    """
+    if lines is None:
+        date_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lines = [f"CONVERTED FROM TEXT FILE {date_str}"] + [""] * 38 + ["END TEXTUAL HEADER"]
+    if len(lines) > 40:
+        raise ValueError(f"Textual header has {len(lines)} cards, at most 40 allowed")
+    
+    # Lay out the cards in ASCII, then translate the whole header at once
+    text = "".join(f"C{i:02d} {line}"[:80].ljust(80) for i, line in enumerate(lines, 1))
+    return text.ljust(3200).encode('latin-1', 'replace').translate(ASCII_TO_EBCDIC)
+
+def create_binary_header(num_samples, sample_interval=2000, fixed_length=True, format_code=5):
     """
     Create Binary header (400 bytes)
     
     Parameters:
     num_samples (int): Number of samples in the trace
     sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    fixed_length (bool): Whether all traces have num_samples samples (default: True)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
     """
     # Initialize with zeros
     header = bytearray(400)
     struct.pack_into('>H', header, 16, sample_interval)
     
     # Bytes 3227-3228 (3-4): Number of samples per trace
-    struct.pack_into('>H', header, 20, num_samples)
+    # Longer traces store 0 here and use the rev2 extended field below
+    struct.pack_into('>H', header, 20, num_samples if num_samples <= 65535 else 0)
     
     # Bytes 3229-3230 (5-6): Data sample format code
     # 1 = 4-byte IBM floating-point
     # 5 = 4-byte IEEE floating-point
-    format_code = 5  # IEEE floating-point
     struct.pack_into('>H', header, 24, format_code)
     
     # Bytes 3501-3502 (277-278): SEG-Y Revision number
     # 0x0100 = Revision 1.0
-    struct.pack_into('>H', header, 300, 0x0100)
+    # 0x0200 = Revision 2.0, needed for more than 65535 samples per trace
+    if num_samples <= 65535:
+        struct.pack_into('>H', header, 300, 0x0100)
+    else:
+        struct.pack_into('>H', header, 300, 0x0200)
+        
+        # Bytes 3269-3272 (69-72): Extended number of samples per data trace
+        struct.pack_into('>I', header, 68, num_samples)
+        
+        # Bytes 3297-3300 (97-100): Byte order constant 0x01020304
+        struct.pack_into('>I', header, 96, 0x01020304)
     
     # Bytes 3503-3504 (279-280): Fixed length trace flag
     # 1 = all traces have the same number of samples
-    struct.pack_into('>H', header, 302, 1)
+    struct.pack_into('>H', header, 302, 1 if fixed_length else 0)
     
     # Bytes 3505-3506 (281-282): Number of extended textual headers
     # 0 = no extended headers
@@ -123,54 +356,431 @@ def create_binary_header(num_samples, sample_interval=2000):
     
     return header
 
-def write_trace(f, data, sample_interval=2000):
+def create_trace_header(num_samples, sample_interval=2000, sequence=1):
     """
-    Write a single SEG-Y trace
+    Create a trace header (240 bytes)
     
     Parameters:
-    f (file): Output file object
-    data (numpy.ndarray): Array of trace samples
+    num_samples (int): Number of samples in this trace
     sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    sequence (int): Trace sequence number within the line and the file (default: 1)
     """
-    # Create trace header (240 bytes)
     trace_header = bytearray(240)
     
-    # Set important values in trace header
+    # Bytes 1-4 and 5-8: Trace sequence number within line and within file
+    struct.pack_into('>ii', trace_header, 0, sequence, sequence)
+    
     # Bytes 115-116: Number of samples in this trace
-    num_samples = len(data)
-    struct.pack_into('>H', trace_header, 114, num_samples)
+    # 0 = more than 65535, taken from the binary header instead
+    struct.pack_into('>H', trace_header, 114, num_samples if num_samples <= 65535 else 0)
     
     # Bytes 117-118: Sample interval in microseconds
     struct.pack_into('>H', trace_header, 116, sample_interval)
     
-    # Write trace header
-    f.write(trace_header)
+    return trace_header
+
+def write_trace(f, data, sample_interval=2000, sequence=1, format_code=5):
+    """
+    Write a single SEG-Y trace
+    
+    Parameters:
+    f (file): Output file object
+    data (numpy.ndarray): Array of trace samples
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    sequence (int): Trace sequence number within the line and the file (default: 1)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    """
+    # Write trace header (240 bytes)
+    f.write(create_trace_header(len(data), sample_interval, sequence))
+    
+    # Write trace data samples (4 bytes each), encoded in one big-endian
+    # buffer and written with a single call
+    f.write(encode_samples(data, format_code).tobytes())
+
+def trace_dtype(num_samples, format_code=5):
+    """
+    Build the record dtype of one fixed-length SEG-Y trace
+    
+    Only the trace header fields this tool fills are named; the rest of the
+    240-byte header is left as padding.
     
-    # Write trace data samples as IEEE floating-point (4 bytes each)
-    for sample in data:
-        f.write(struct.pack('>f', sample))
+    Parameters:
+    num_samples (int): Number of samples in each trace
+    format_code (int): 5 for IEEE float data, 1 for raw IBM float words (default: 5)
+    
+    Returns:
+    numpy.dtype: Big-endian record dtype of 240 + 4 * num_samples bytes
+    """
+    return np.dtype({
+        # Bytes 1-4: Trace sequence number within line
+        # Bytes 5-8: Trace sequence number within SEG-Y file
+        # Bytes 115-116: Number of samples in this trace
+        # Bytes 117-118: Sample interval in microseconds
+        # Bytes 241-: Trace data samples (IEEE floats or IBM float words)
+        'names': ['line_sequence', 'file_sequence', 'num_samples', 'sample_interval', 'data'],
+        'formats': ['>i4', '>i4', '>u2', '>u2', ('>u4' if format_code == 1 else '>f4', (num_samples,))],
+        'offsets': [0, 4, 114, 116, 240],
+        'itemsize': 240 + 4 * num_samples,
+    })
+
+def write_traces(f, data, sample_interval=2000, format_code=5):
+    """
+    Write every column of a samples x traces matrix as a SEG-Y trace
+    
+    All trace headers and data blocks are assembled in one preallocated
+    record buffer and written with a single call.
+    
+    Parameters:
+    f (file): Output file object
+    data (numpy.ndarray): 2-D array of shape (samples, traces)
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    """
+    num_samples, num_traces = data.shape
+    records = np.zeros(num_traces, dtype=trace_dtype(num_samples, format_code))
+    fill_trace_records(records, data, sample_interval, format_code=format_code)
+    
+    f.write(records.view(np.uint8))
+
+def fill_trace_records(records, data, sample_interval=2000, first_sequence=1, format_code=5):
+    """
+    Fill trace records with the same header fields as create_trace_header
+    
+    Parameters:
+    records (numpy.ndarray): Record array of trace_dtype (in memory or memmap)
+    data (numpy.ndarray): 2-D array of shape (samples, traces)
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    first_sequence (int): Sequence number of the first record (default: 1)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    """
+    # Sequence numbers count up from the first trace
+    sequence = np.arange(first_sequence, first_sequence + len(records))
+    records['line_sequence'] = sequence
+    records['file_sequence'] = sequence
+    records['num_samples'] = data.shape[0] if data.shape[0] <= 65535 else 0
+    records['sample_interval'] = sample_interval
+    records['data'] = encode_samples(data.T, format_code)
+
+def allocate_segy_file(output_file, num_traces, num_samples, sample_interval=2000, format_code=5):
+    """
+    Create a fixed-length SEG-Y file of its final size for in-place filling
+    
+    The file is exactly 3600 + num_traces * (240 + 4 * num_samples) bytes;
+    the trace area is left zeroed (sparse where the filesystem allows).
+    
+    Parameters:
+    output_file (str): Path to the output SEG-Y file
+    num_traces (int): Number of traces
+    num_samples (int): Number of samples in every trace
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    """
+    with open(output_file, 'wb') as f:
+        f.write(create_ebcdic_header())
+        f.write(create_binary_header(num_samples, sample_interval, format_code=format_code))
+        f.truncate(3600 + num_traces * trace_dtype(num_samples).itemsize)
+
+def open_trace_records(output_file, num_samples, start=0, stop=None, mode='r+', format_code=5):
+    """
+    Memory-map a range of traces of a fixed-length SEG-Y file
+    
+    Disjoint ranges can be opened and written by separate processes at the
+    same time.
+    
+    Parameters:
+    output_file (str): Path to the SEG-Y file
+    num_samples (int): Number of samples in every trace
+    start (int): Index of the first trace to map (default: 0)
+    stop (int): Index one past the last trace to map (default: end of file)
+    mode (str): np.memmap mode (default: 'r+')
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    
+    Returns:
+    numpy.memmap: Record array of trace_dtype(num_samples, format_code)
+    """
+    dtype = trace_dtype(num_samples, format_code)
+    if stop is None:
+        stop = (os.path.getsize(output_file) - 3600) // dtype.itemsize
+    return np.memmap(output_file, dtype=dtype, mode=mode,
+                     offset=3600 + start * dtype.itemsize, shape=(stop - start,))
+
+def write_trace_region(task):
+    """
+    Parse input files into consecutive traces of a preallocated SEG-Y file
+    
+    Parameters:
+    task (tuple): (output_file, input_files, start, num_samples, sample_interval,
+        format_code) where start is the trace index of the first input
+    
+    Returns:
+    int: Number of traces written
+    """
+    output_file, input_files, start, num_samples, sample_interval, format_code = task
+    records = open_trace_records(output_file, num_samples, start, start + len(input_files),
+                                 format_code=format_code)
+    for i, input_file in enumerate(input_files):
+        data = read_text_data(input_file)
+        if len(data) != num_samples:
+            raise ValueError(f"{input_file} has {len(data)} samples, expected {num_samples}")
+        fill_trace_records(records[i:i + 1], data[:, np.newaxis], sample_interval, start + i + 1, format_code)
+    records.flush()
+    return len(input_files)
+
+def expand_inputs(inputs, ordered=False):
+    """
+    Resolve input paths, glob patterns and directories to a list of files
+    
+    Directories contribute every regular file they contain except existing
+    .sgy outputs.
+    
+    Parameters:
+    inputs (list): Input paths, glob patterns or directories
+    ordered (bool): Keep the order and repeats of the inputs, sorting only
+        the files matched by each glob pattern or directory (default: False)
+    
+    Returns:
+    list: Input file paths, sorted and de-duplicated unless ordered
+    """
+    files = []
+    for pattern in inputs:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            if os.path.isdir(path):
+                for name in sorted(os.listdir(path)):
+                    entry = os.path.join(path, name)
+                    if os.path.isfile(entry) and not name.lower().endswith('.sgy'):
+                        files.append(entry)
+            else:
+                files.append(path)
+    return files if ordered else sorted(set(files))
+
+def convert_file(task):
+    """
+    Convert one input file in a batch worker
+    
+    Parameters:
+    task (tuple): (input_file, output_file, sample_interval, split_samples, format_code)
+    
+    Returns:
+    tuple: (input_file, output_file, num_samples, error message or None)
+    """
+    input_file, output_file, sample_interval, split_samples, format_code = task
+    try:
+        num_samples, _ = stream_segy_file(input_file, output_file, sample_interval,
+                                          split_samples=split_samples, format_code=format_code)
+    except Exception as e:
+        return input_file, output_file, 0, str(e)
+    return input_file, output_file, num_samples, None
+
+def convert_batch(input_files, output_dir=None, sample_interval=2000, workers=None, split_samples=None,
+                  format_code=5):
+    """
+    Convert many text/CSV files to single-trace SEG-Y files on a process pool
+    
+    Raises ValueError before converting anything if two inputs would be
+    written to the same output file.
+    
+    Parameters:
+    input_files (list): Paths to the input text or CSV files
+    output_dir (str): Directory for the outputs (default: next to each input)
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    workers (int): Number of worker processes (default: one per CPU)
+    split_samples (int): Maximum number of samples per trace (default: no limit)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    
+    Returns:
+    int: Number of files that failed to convert
+    """
+    tasks = []
+    for input_file in input_files:
+        output_file = os.path.splitext(input_file)[0] + '.sgy'
+        if output_dir:
+            output_file = os.path.join(output_dir, os.path.basename(output_file))
+        tasks.append((input_file, output_file, sample_interval, split_samples, format_code))
+    
+    # Inputs differing only in directory or extension would overwrite each other's output
+    outputs = collections.Counter(os.path.abspath(task[1]) for task in tasks)
+    clashes = sorted(path for path, count in outputs.items() if count > 1)
+    if clashes:
+        raise ValueError(f"Several inputs would be converted to the same output file: {', '.join(clashes)}")
+    
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    workers = workers or os.cpu_count() or 1
+    # Hand out many small files per round trip to amortize IPC overhead
+    chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for input_file, output_file, num_samples, error in executor.map(convert_file, tasks, chunksize=chunksize):
+            if error:
+                failed += 1
+                print(f"Error: {input_file}: {error}")
+            else:
+                print(f"{input_file} -> {output_file} ({num_samples} samples)")
+    elapsed = time.perf_counter() - start
+    
+    print(f"Converted {len(tasks) - failed} of {len(tasks)} files in {elapsed:.2f} s "
+          f"({len(tasks) / elapsed if elapsed else 0:.1f} files/s, {workers} workers)")
+    return failed
+
+def merge_segy_file(input_files, output_file, sample_interval=2000, workers=None, preallocate=False,
+                    format_code=5):
+    """
+    Merge many text/CSV files into one multi-trace SEG-Y file
+    
+    Inputs are parsed on a process pool while a single writer appends the
+    traces in input order. Only a bounded window of parsed traces is held in
+    memory at any time.
+    
+    Traces longer than 65535 samples are only possible when all inputs have
+    the same length; otherwise ValueError is raised and no output is written.
+    
+    With preallocate=True all inputs must have the same length as the first
+    one; the output is created at its final size and each worker parses and
+    writes its own contiguous range of traces through a memory map.
+    
+    Parameters:
+    input_files (list): Paths to the input text or CSV files, one per trace
+    output_file (str): Path to the output SEG-Y file
+    sample_interval (int): Sample interval in microseconds (default: 2000 = 2ms)
+    workers (int): Number of parser processes (default: one per CPU)
+    preallocate (bool): Write fixed-length traces in parallel regions (default: False)
+    format_code (int): Data sample format code, 5 = IEEE or 1 = IBM floating-point (default: 5)
+    
+    Returns:
+    list: Number of samples in each written trace
+    """
+    workers = workers or os.cpu_count() or 1
+    trace_lengths = []
+    
+    # Write to a temporary file so that a failed merge leaves no partial output
+    tmp_file = output_file + '.tmp'
+    try:
+        if preallocate:
+            # The first input sets the trace length and is written here
+            first = read_text_data(input_files[0])
+            num_samples = len(first)
+            allocate_segy_file(tmp_file, len(input_files), num_samples, sample_interval, format_code)
+            records = open_trace_records(tmp_file, num_samples, 0, 1, format_code=format_code)
+            fill_trace_records(records, first[:, np.newaxis], sample_interval, 1, format_code)
+            records.flush()
+            del records
+            
+            # One contiguous range of the remaining traces per task
+            rest = input_files[1:]
+            step = max(1, -(-len(rest) // workers))
+            tasks = [(tmp_file, rest[start:start + step], start + 1, num_samples, sample_interval, format_code)
+                     for start in range(0, len(rest), step)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(write_trace_region, tasks):
+                    pass
+            trace_lengths = [num_samples] * len(input_files)
+        else:
+            with open(tmp_file, 'wb') as f, ProcessPoolExecutor(max_workers=workers) as executor:
+                # Write headers with a placeholder sample count
+                f.write(create_ebcdic_header())
+                f.write(create_binary_header(0, sample_interval, format_code=format_code))
+                
+                # Keep a fixed number of parse jobs in flight and collect them in order
+                remaining = iter(input_files)
+                pending = collections.deque(executor.submit(read_text_data, input_file)
+                                            for input_file in itertools.islice(remaining, 2 * workers))
+                while pending:
+                    data = pending.popleft().result()
+                    for input_file in itertools.islice(remaining, 1):
+                        pending.append(executor.submit(read_text_data, input_file))
+                    
+                    trace_lengths.append(len(data))
+                    write_trace(f, data, sample_interval, len(trace_lengths), format_code)
+                
+                # Rewrite the binary header now that the trace lengths are known
+                num_samples = trace_lengths[0] if trace_lengths else 0
+                fixed_length = all(length == num_samples for length in trace_lengths)
+                
+                # Traces of differing lengths need their own counts in bytes
+                # 115-116, which cannot hold more than 65535 samples
+                if not fixed_length and max(trace_lengths) > 65535:
+                    raise ValueError(f"Traces of different lengths cannot be longer than 65535 samples "
+                                     f"(longest: {max(trace_lengths)})")
+                f.seek(3200)
+                f.write(create_binary_header(num_samples, sample_interval, fixed_length, format_code))
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, output_file)
+    
+    return trace_lengths
 
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Convert text/CSV data to SEG-Y format')
-    parser.add_argument('input_file', type=str, help='Path to the input text or CSV file')
-    parser.add_argument('-o', '--output', type=str, help='Path to the output SEG-Y file (default: input filename with .sgy extension)')
+    parser.add_argument('input_files', type=str, nargs='+',
+                        help='Input text or CSV files; several files, glob patterns or directories run a batch conversion')
+    parser.add_argument('-o', '--output', type=str, help='Path to the output SEG-Y file (default: input filename with .sgy extension); output directory in batch mode')
     parser.add_argument('-s', '--sample-interval', type=int, default=2000, 
                         help='Sample interval in microseconds (default: 2000 = 2ms)')
+    parser.add_argument('-f', '--format', type=int, choices=[1, 5], default=5,
+                        help='Data sample format: 5 = IEEE float (default), 1 = IBM float')
+    parser.add_argument('--split', type=int, default=None, metavar='N',
+                        help='Split each input into consecutive traces of at most N samples')
+    parser.add_argument('-m', '--merge', action='store_true',
+                        help='Merge all inputs into one multi-trace SEG-Y file (default output: merged.sgy)')
+    parser.add_argument('--preallocate', action='store_true',
+                        help='With --merge, preallocate the output and let workers write fixed-length traces in place')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Number of worker processes for batch conversion (default: one per CPU)')
     
     # Parse arguments
     args = parser.parse_args()
     
-    input_file = args.input_file
+    # Get the sample interval
+    sample_interval = args.sample_interval
+    
+    if args.split is not None and args.split < 1:
+        parser.error("--split must be at least 1")
+    
+    # Merge every input into one trace each of a single output file
+    if args.merge:
+        if args.split:
+            parser.error("--split cannot be combined with --merge")
+        # Traces follow the order of the inputs on the command line
+        input_files = expand_inputs(args.input_files, ordered=True)
+        if not input_files:
+            print("Error: No input files found.")
+            return
+        output_file = args.output or 'merged.sgy'
+        try:
+            trace_lengths = merge_segy_file(input_files, output_file, sample_interval,
+                                            args.workers, args.preallocate, args.format)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}")
+            return
+        print(f"Successfully merged {len(input_files)} files to SEG-Y format: {output_file}")
+        print(f"Number of traces: {len(trace_lengths)}")
+        return
+    
+    # Several inputs, globs or directories switch to batch mode
+    if len(args.input_files) > 1 or glob.has_magic(args.input_files[0]) or os.path.isdir(args.input_files[0]):
+        input_files = expand_inputs(args.input_files)
+        if not input_files:
+            print("Error: No input files found.")
+            return
+        try:
+            convert_batch(input_files, args.output, sample_interval, args.workers, args.split, args.format)
+        except ValueError as e:
+            print(f"Error: {e}")
+        return
+    
+    input_file = args.input_files[0]
     output_file = args.output
     
     # If no output file is specified, use the input filename with .sgy extension
     if not output_file:
         output_file = os.path.splitext(input_file)[0] + '.sgy'
     
-    # Get the sample interval
-    sample_interval = args.sample_interval
-    
     # Check if input file exists
     if not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' does not exist.")
@@ -178,7 +788,7 @@ def main():
     
     # Convert the file
     try:
-        create_segy_file(input_file, output_file, sample_interval)
+        create_segy_file(input_file, output_file, sample_interval, args.split, args.format)
     except ValueError as e:
         print(f"Error: {e}")
         return